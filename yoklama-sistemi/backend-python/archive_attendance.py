@@ -0,0 +1,29 @@
+"""Eski kapanmış yoklamaları arşiv koleksiyonuna taşır.
+
+Kullanım:
+    python archive_attendance.py [--days 180] [--batch-size 500]
+"""
+import argparse
+
+from main import ATTENDANCE_ARCHIVE_BATCH_SIZE, ATTENDANCE_ARCHIVE_DAYS, archive_old_attendance, create_indexes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Eski yoklama oturumlarını arşivle")
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=ATTENDANCE_ARCHIVE_DAYS,
+        help="Bu günden daha eski kapanmış oturumlar arşivlenir",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=ATTENDANCE_ARCHIVE_BATCH_SIZE,
+        help="Tek seferde arşive yazılıp silinecek en fazla oturum sayısı",
+    )
+    args = parser.parse_args()
+
+    create_indexes()
+    result = archive_old_attendance(args.days, args.batch_size)
+    print(f"{result['archived_sessions']} oturum, {result['archive_documents']} arşiv belgesine taşındı")
@@ -1,4 +1,5 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
 from pymongo import MongoClient
@@ -12,6 +13,8 @@ from dotenv import load_dotenv
 from bson import ObjectId
 import random
 import string
+import asyncio
+import anyio.to_thread
 
 # .env dosyasını yükle
 load_dotenv()
@@ -19,19 +22,157 @@ load_dotenv()
 # MongoDB bağlantısı
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
 client = MongoClient(MONGO_URI)
-db = client.yoklama_sistemi
+db = client[os.getenv("MONGO_DB", "yoklama_sistemi")]
 
 # JWT ayarları
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Arşivleme ayarları (bu süreden eski kapanmış yoklamalar arşive taşınır)
+ATTENDANCE_ARCHIVE_DAYS = int(os.getenv("ATTENDANCE_ARCHIVE_DAYS", "180"))
+ATTENDANCE_ARCHIVE_BATCH_SIZE = int(os.getenv("ATTENDANCE_ARCHIVE_BATCH_SIZE", "500"))
+
 # Şifreleme ayarları
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Yük altında kabul kontrolü ayarları
+# Her öncelik sınıfı için: aynı anda işlenebilecek istek sayısı ve kuyrukta bekleme bütçesi (saniye)
+ADMISSION_CLASSES = {
+    "critical": {
+        "limit": int(os.getenv("ADMISSION_CRITICAL_LIMIT", "64")),
+        "max_wait": float(os.getenv("ADMISSION_CRITICAL_MAX_WAIT", "10.0")),
+    },
+    "normal": {
+        "limit": int(os.getenv("ADMISSION_NORMAL_LIMIT", "32")),
+        "max_wait": float(os.getenv("ADMISSION_NORMAL_MAX_WAIT", "2.0")),
+    },
+    "low": {
+        "limit": int(os.getenv("ADMISSION_LOW_LIMIT", "8")),
+        "max_wait": float(os.getenv("ADMISSION_LOW_MAX_WAIT", "0.5")),
+    },
+}
+# (HTTP metodu, yol) -> öncelik sınıfı ve isteğe bağlı yol başına eşzamanlılık limiti;
+# eşleşmeyen istekler "normal" sayılır
+ADMISSION_ROUTES = {
+    ("POST", "/attendance/submit"): {"priority": "critical"},
+    ("POST", "/attendance/start"): {"priority": "critical"},
+    ("POST", "/attendance/end"): {"priority": "critical"},
+    ("POST", "/token"): {"priority": "low", "limit": int(os.getenv("ADMISSION_TOKEN_LIMIT", "4"))},
+    ("POST", "/setup-test-users"): {"priority": "low", "limit": 1},
+}
+# Parametreli yollar için önek eşleşmesi
+ADMISSION_PREFIX_ROUTES = {
+    ("GET", "/attendance/history/"): {"priority": "low", "limit": int(os.getenv("ADMISSION_HISTORY_LIMIT", "4"))},
+}
+ADMISSION_RETRY_AFTER_SECONDS = 2
+
+def get_route_limits():
+    """Limit tanımlanmış yolları "METOD yol" anahtarıyla döndürür"""
+    routes = {**ADMISSION_ROUTES, **ADMISSION_PREFIX_ROUTES}
+    return {f"{method} {path}": config["limit"] for (method, path), config in routes.items() if "limit" in config}
+
+async def acquire_semaphore(semaphore: asyncio.Semaphore, timeout: float):
+    """Semaforu en fazla `timeout` saniye bekleyerek alır; boş semafor bütçe bitmiş olsa da alınır"""
+    if not semaphore.locked():
+        await semaphore.acquire()
+        return
+    await asyncio.wait_for(semaphore.acquire(), timeout=timeout)
+
+class AdmissionController:
+    """Öncelik sınıfı ve yol başına eşzamanlılık sınırı uygular, aşırı yükte düşük öncelikli istekleri reddeder"""
+
+    def __init__(self, classes: dict, route_limits: Optional[dict] = None):
+        self.classes = classes
+        self.semaphores = {name: asyncio.Semaphore(config["limit"]) for name, config in classes.items()}
+        self.stats = {
+            name: {"limit": config["limit"], "in_flight": 0, "queued": 0, "admitted": 0, "shed": 0}
+            for name, config in classes.items()
+        }
+        route_limits = get_route_limits() if route_limits is None else route_limits
+        self.route_semaphores = {route: asyncio.Semaphore(limit) for route, limit in route_limits.items()}
+        self.route_stats = {
+            route: {"limit": limit, "in_flight": 0, "shed": 0}
+            for route, limit in route_limits.items()
+        }
+
+    def classify(self, method: str, path: str):
+        """İsteğin öncelik sınıfını ve (varsa) yol limiti anahtarını döndürür"""
+        config, route = None, None
+        if (method, path) in ADMISSION_ROUTES:
+            config, route = ADMISSION_ROUTES[(method, path)], f"{method} {path}"
+        else:
+            for (route_method, prefix), prefix_config in ADMISSION_PREFIX_ROUTES.items():
+                if method == route_method and path.startswith(prefix):
+                    config, route = prefix_config, f"{method} {prefix}"
+                    break
+        if config is None:
+            return "normal", None
+        return config["priority"], route if route in self.route_semaphores else None
+
+    async def acquire(self, priority: str, route: Optional[str] = None):
+        stats = self.stats[priority]
+        # Kritik istekler kuyrukta beklerken düşük öncelikli istekleri hemen reddet
+        if priority == "low" and self.stats["critical"]["queued"] > 0:
+            stats["shed"] += 1
+            return False
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.classes[priority]["max_wait"]
+        stats["queued"] += 1
+        try:
+            await acquire_semaphore(self.semaphores[priority], deadline - loop.time())
+            if route is not None:
+                try:
+                    # Yol limiti, sınıfın kalan bekleme bütçesi içinde alınmalı
+                    await acquire_semaphore(self.route_semaphores[route], deadline - loop.time())
+                except asyncio.TimeoutError:
+                    self.semaphores[priority].release()
+                    self.route_stats[route]["shed"] += 1
+                    raise
+        except asyncio.TimeoutError:
+            stats["shed"] += 1
+            return False
+        finally:
+            stats["queued"] -= 1
+
+        stats["in_flight"] += 1
+        stats["admitted"] += 1
+        if route is not None:
+            self.route_stats[route]["in_flight"] += 1
+        return True
+
+    def release(self, priority: str, route: Optional[str] = None):
+        if route is not None:
+            self.route_stats[route]["in_flight"] -= 1
+            self.route_semaphores[route].release()
+        self.stats[priority]["in_flight"] -= 1
+        self.semaphores[priority].release()
+
+admission_controller = AdmissionController(ADMISSION_CLASSES)
+
 app = FastAPI()
 
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    if request.method == "OPTIONS":
+        return await call_next(request)
+
+    priority, route = admission_controller.classify(request.method, request.url.path)
+    if not await admission_controller.acquire(priority, route):
+        print(f"Shedding {priority} request: {request.method} {request.url.path}")  # Debug log
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Sunucu şu anda yoğun, lütfen tekrar deneyin"},
+            headers={"Retry-After": str(ADMISSION_RETRY_AFTER_SECONDS)}
+        )
+
+    try:
+        return await call_next(request)
+    finally:
+        admission_controller.release(priority, route)
+
 # CORS ayarları
 app.add_middleware(
     CORSMiddleware,
@@ -75,7 +216,7 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
+def get_current_user(token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -106,15 +247,151 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     print(f"Validated user: {user}")  # Debug log
     return user
 
+def configure_thread_limiter():
+    """Thread pool'u tüm öncelik sınıflarının toplam limitine göre boyutlandırır.
+
+    Senkron endpoint'ler ve bağımlılıklar (ör. get_current_user) AnyIO'nun ortak
+    thread pool'unu kullanır. Pool en az sınıf limitlerinin toplamı kadar büyük
+    olduğunda normal ve düşük öncelikli istekler tüm thread'leri tutamaz, kritik
+    istekler her zaman boş bir thread bulur.
+    """
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = sum(config["limit"] for config in admission_controller.classes.values())
+
+def create_indexes():
+    """Sık kullanılan sorgular için gerekli indeksleri oluşturur (tekrar çağrılabilir)"""
+    db.attendance.create_index([("course_id", 1), ("is_active", 1)])
+    db.attendance_archive.create_index([("course_id", 1), ("term", 1)], unique=True)
+
+@app.on_event("startup")
+async def on_startup():
+    configure_thread_limiter()
+    create_indexes()
+
 # Yardımcı fonksiyonlar
 def generate_attendance_code(length=6):
     """Büyük harfler ve rakamlardan oluşan rastgele bir kod üretir"""
     characters = string.ascii_uppercase + string.digits
     return ''.join(random.choices(characters, k=length))
 
+def parse_attendance_date(value):
+    """Yoklama tarihini (ISO veya "%Y-%m-%d %H:%M:%S") saat dilimsiz datetime'a çevirir"""
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        parsed = datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+    # Saat dilimi bilgisi olan tarihleri önce yerel saate çevir
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone()
+    return parsed.replace(tzinfo=None)
+
+def get_term(date: datetime):
+    """Tarihin ait olduğu dönemi döndürür (ör. "2024-guz", "2025-bahar")"""
+    if date.month >= 8:
+        return f"{date.year}-guz"
+    if date.month == 1:
+        return f"{date.year - 1}-guz"
+    return f"{date.year}-bahar"
+
+def write_archive_batch(course_id: str, term: str, records: list):
+    """Bir ders ve döneme ait oturumları arşiv belgesine ekler, ardından sıcak koleksiyondan siler.
+
+    Arşiv belgesi öğrenci e-postalarını bir kez `student_index` dizisinde tutar,
+    her oturum ise katılan öğrencileri bu dizideki sıra numaralarıyla saklar.
+    """
+    archive = db.attendance_archive.find_one({"course_id": course_id, "term": term}) or {
+        "course_id": course_id,
+        "term": term,
+        "student_index": [],
+        "sessions": []
+    }
+    student_positions = {email: i for i, email in enumerate(archive["student_index"])}
+    known_sessions = {session["_id"] for session in archive["sessions"]}
+
+    for record in records:
+        if str(record["_id"]) in known_sessions:
+            continue
+        attended = []
+        for email in record.get("students", []):
+            if email not in student_positions:
+                student_positions[email] = len(archive["student_index"])
+                archive["student_index"].append(email)
+            attended.append(student_positions[email])
+        archive["sessions"].append({
+            "_id": str(record["_id"]),
+            "date": record["date"],
+            "code": record.get("code"),
+            "attended": attended
+        })
+
+    archive["updated_at"] = datetime.now()
+    db.attendance_archive.replace_one(
+        {"course_id": course_id, "term": term},
+        archive,
+        upsert=True
+    )
+
+    # Arşive yazıldıktan sonra sıcak koleksiyondan sil
+    db.attendance.delete_many({"_id": {"$in": [record["_id"] for record in records]}})
+
+def archive_old_attendance(horizon_days: int = ATTENDANCE_ARCHIVE_DAYS, batch_size: int = ATTENDANCE_ARCHIVE_BATCH_SIZE):
+    """Eski kapanmış yoklamaları ders ve dönem başına tek bir arşiv belgesine taşır"""
+    cutoff = datetime.now() - timedelta(days=horizon_days)
+    # "%Y-%m-%d %H:%M:%S" biçimindeki tarihler metin olarak da doğru sıralanır
+    query = {"is_active": False, "date": {"$lt": cutoff.strftime("%Y-%m-%d %H:%M:%S")}}
+    projection = {"course_id": 1, "date": 1, "code": 1, "students": 1}
+
+    archived_sessions = 0
+    archive_documents = set()
+    for course_id in db.attendance.distinct("course_id", query):
+        records = db.attendance.find({**query, "course_id": course_id}, projection).sort("date", 1)
+
+        batch_term = None
+        batch = []
+        for record in records:
+            try:
+                date = parse_attendance_date(record["date"])
+            except Exception as e:
+                print(f"Skipping record with unparsable date {record.get('date')}: {str(e)}")
+                continue
+            if date >= cutoff:
+                continue
+
+            term = get_term(date)
+            if batch and (term != batch_term or len(batch) >= batch_size):
+                write_archive_batch(course_id, batch_term, batch)
+                archived_sessions += len(batch)
+                batch = []
+            batch_term = term
+            batch.append(record)
+            archive_documents.add((course_id, term))
+
+        if batch:
+            write_archive_batch(course_id, batch_term, batch)
+            archived_sessions += len(batch)
+
+    print(f"Archived {archived_sessions} attendance records into {len(archive_documents)} archive documents")
+    return {"archived_sessions": archived_sessions, "archive_documents": len(archive_documents)}
+
+def load_archived_attendance(course_id: str):
+    """Arşivdeki oturumları `attendance` koleksiyonundaki kayıt biçimine geri açar"""
+    records = []
+    for archive in db.attendance_archive.find({"course_id": course_id}):
+        student_index = archive.get("student_index", [])
+        for session in archive.get("sessions", []):
+            records.append({
+                "_id": session["_id"],
+                "course_id": course_id,
+                "date": session["date"],
+                "code": session.get("code"),
+                "is_active": False,
+                "students": [student_index[i] for i in session.get("attended", [])]
+            })
+    return records
+
 # Endpoint'ler
 @app.post("/register")
-async def register(user: User):
+def register(user: User):
     if db.users.find_one({"email": user.email}):
         raise HTTPException(
             status_code=400,
@@ -128,8 +405,9 @@ async def register(user: User):
     db.users.insert_one(user_dict)
     return {"message": "User created successfully"}
 
+# bcrypt doğrulaması event loop'u bloklamasın diye senkron tanımlı (thread pool'da çalışır)
 @app.post("/token")
-async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+def login(form_data: OAuth2PasswordRequestForm = Depends()):
     print(f"Login attempt for email: {form_data.username}")  # Debug log
     
     # Tüm kullanıcıları kontrol et
@@ -150,7 +428,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.get("/courses")
-async def get_courses(current_user: dict = Depends(get_current_user)):
+def get_courses(current_user: dict = Depends(get_current_user)):
     try:
         print("Current user:", current_user)  # Debug log
         print("Role:", current_user.get("role"))  # Debug log
@@ -513,7 +791,7 @@ async def end_attendance(request: dict, current_user: dict = Depends(get_current
         )
 
 @app.get("/attendance/history/{course_id}")
-async def get_attendance_history(course_id: str, current_user: dict = Depends(get_current_user)):
+def get_attendance_history(course_id: str, current_user: dict = Depends(get_current_user)):
     try:
         print("Getting attendance history for course:", course_id)  # Debug log
         print("Current user:", current_user)  # Debug log
@@ -552,15 +830,14 @@ async def get_attendance_history(course_id: str, current_user: dict = Depends(ge
             attendance_records = list(db.attendance.find(
                 {"course_id": str(course["_id"]), "is_active": False}
             ))
+            # Arşive taşınmış eski oturumları da ekle
+            attendance_records.extend(load_archived_attendance(str(course["_id"])))
 
             # Tarihleri datetime objesine çevir ve sırala
             for record in attendance_records:
                 try:
                     # ISO format veya normal string format kontrolü
-                    try:
-                        record["date"] = datetime.fromisoformat(record["date"].replace('Z', '+00:00'))
-                    except:
-                        record["date"] = datetime.strptime(record["date"], "%Y-%m-%d %H:%M:%S")
+                    record["date"] = parse_attendance_date(record["date"])
                 except Exception as e:
                     print(f"Date parsing error for {record['date']}: {str(e)}")
                     # Hatalı tarih formatı durumunda varsayılan tarih kullan
@@ -613,6 +890,115 @@ async def get_attendance_history(course_id: str, current_user: dict = Depends(ge
             detail=f"Internal server error: {str(e)}"
         )
 
+def build_student_dashboard_pipeline(student_email: str):
+    """Öğrencinin derslerini ve yoklama özetini tek sorguda getiren aggregation pipeline'ı"""
+    return [
+        {"$match": {"student_emails": student_email}},
+        {"$addFields": {"course_id": {"$toString": "$_id"}}},
+        # localField/foreignField eşleşmesi attendance.course_id indeksini kullanır (MongoDB 5.0+)
+        {"$lookup": {
+            "from": "attendance",
+            "localField": "course_id",
+            "foreignField": "course_id",
+            "pipeline": [
+                {"$project": {
+                    "is_active": 1,
+                    "attended": {"$in": [student_email, {"$ifNull": ["$students", []]}]}
+                }},
+                {"$group": {
+                    "_id": None,
+                    "has_active_attendance": {"$max": "$is_active"},
+                    "already_attended": {"$max": {"$and": ["$is_active", "$attended"]}},
+                    "total_sessions": {"$sum": {"$cond": ["$is_active", 0, 1]}},
+                    "attended_sessions": {"$sum": {
+                        "$cond": [{"$and": [{"$not": ["$is_active"]}, "$attended"]}, 1, 0]
+                    }}
+                }}
+            ],
+            "as": "stats"
+        }},
+        # Arşive taşınmış oturumlar (öğrenci, student_index içindeki sırasıyla aranır)
+        {"$lookup": {
+            "from": "attendance_archive",
+            "localField": "course_id",
+            "foreignField": "course_id",
+            "pipeline": [
+                {"$project": {
+                    "total_sessions": {"$size": "$sessions"},
+                    "attended_sessions": {"$size": {"$filter": {
+                        "input": "$sessions",
+                        "as": "session",
+                        "cond": {"$in": [
+                            {"$indexOfArray": ["$student_index", student_email]},
+                            "$$session.attended"
+                        ]}
+                    }}}
+                }},
+                {"$group": {
+                    "_id": None,
+                    "total_sessions": {"$sum": "$total_sessions"},
+                    "attended_sessions": {"$sum": "$attended_sessions"}
+                }}
+            ],
+            "as": "archived_stats"
+        }},
+        {"$project": {
+            "_id": {"$toString": "$_id"},
+            "name": 1,
+            "code": 1,
+            "schedule": 1,
+            "stats": {"$ifNull": [{"$arrayElemAt": ["$stats", 0]}, {}]},
+            "archived_stats": {"$ifNull": [{"$arrayElemAt": ["$archived_stats", 0]}, {}]}
+        }}
+    ]
+
+@app.get("/me/dashboard")
+def get_student_dashboard(current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "student":
+        raise HTTPException(
+            status_code=403,
+            detail="Only students can view the student dashboard"
+        )
+
+    try:
+        courses = list(db.courses.aggregate(
+            build_student_dashboard_pipeline(current_user["email"])
+        ))
+    except Exception as e:
+        print("Error building student dashboard:", str(e))  # Debug log
+        raise HTTPException(
+            status_code=500,
+            detail=f"Database error: {str(e)}"
+        )
+
+    for course in courses:
+        stats = course.pop("stats")
+        archived_stats = course.pop("archived_stats")
+        total_sessions = stats.get("total_sessions", 0) + archived_stats.get("total_sessions", 0)
+        attended_sessions = stats.get("attended_sessions", 0) + archived_stats.get("attended_sessions", 0)
+        course["has_active_attendance"] = bool(stats.get("has_active_attendance"))
+        course["already_attended"] = bool(stats.get("already_attended"))
+        course["total_sessions"] = total_sessions
+        course["attended_sessions"] = attended_sessions
+        course["attendance_percentage"] = (
+            round(attended_sessions * 100 / total_sessions, 1) if total_sessions else 0.0
+        )
+
+    return {
+        "email": current_user["email"],
+        "full_name": current_user.get("full_name"),
+        "courses": courses
+    }
+
+@app.get("/admission/stats")
+async def get_admission_stats(current_user: dict = Depends(get_current_user)):
+    if current_user["role"] != "teacher":
+        raise HTTPException(
+            status_code=403,
+            detail="Only teachers can view admission stats"
+        )
+    return {"classes": admission_controller.stats, "routes": admission_controller.route_stats}
+
 @app.post("/setup-test-users")
 async def setup_test_users():
     try:
@@ -659,7 +1045,7 @@ async def setup_test_users():
         )
 
 @app.post("/create-user")
-async def create_user(user: User, current_user: dict = Depends(get_current_user)):
+def create_user(user: User, current_user: dict = Depends(get_current_user)):
     # Sadece öğretmenler yeni kullanıcı ekleyebilir
     if current_user["role"] != "teacher":
         raise HTTPException(
@@ -0,0 +1,179 @@
+"""Performans çalışmaları için büyük ve tekrarlanabilir test verisi üretir.
+
+Aynı preset, seed ve bitiş tarihi her zaman aynı veriyi üretir. Tüm kullanıcılar
+aynı şifreyi ("123456") kullanır; bcrypt özeti bir kez hesaplanıp tekrar
+kullanılır. Giriş için ör. ogretmen0@ogretmen.edu.tr veya ogrenci0@ogrenci.edu.tr.
+
+Kullanım:
+    python seed_data.py --preset medium --seed 42 --drop
+"""
+import argparse
+import random
+import sys
+import string
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from main import create_indexes, db, get_password_hash
+
+# Benchmark ve sorgu sayısı testlerinin paylaştığı boyut presetleri
+# courses_per_student: her öğrencinin kayıtlı olduğu ders sayısı aralığı (en az, en çok)
+SIZE_PRESETS = {
+    "tiny": {"teachers": 2, "students": 20, "courses": 3, "courses_per_student": (1, 3), "years": 1},
+    "small": {"teachers": 20, "students": 1000, "courses": 30, "courses_per_student": (4, 6), "years": 1},
+    "medium": {"teachers": 100, "students": 10000, "courses": 150, "courses_per_student": (5, 7), "years": 2},
+    "large": {"teachers": 300, "students": 30000, "courses": 400, "courses_per_student": (5, 7), "years": 4},
+}
+
+DEFAULT_PASSWORD = "123456"
+DEFAULT_END_DATE = "2025-06-30"
+BATCH_SIZE = 5000
+WEEKS_PER_TERM = 14
+
+FIRST_NAMES = ["Ahmet", "Mehmet", "Ayşe", "Fatma", "Ali", "Zeynep", "Mustafa", "Elif", "Emre", "Selin", "Burak", "Deniz"]
+LAST_NAMES = ["Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Aydın", "Öztürk", "Arslan", "Doğan"]
+COURSE_SUBJECTS = ["Matematik", "Fizik", "Kimya", "Biyoloji", "Programlama", "Veri Yapıları", "İstatistik", "Tarih", "Ekonomi", "Algoritmalar"]
+WEEKDAYS = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma"]
+HOURS = [9, 10, 11, 13, 14, 15, 16]
+
+def object_id(rng: random.Random):
+    """Seed'e bağlı, tekrarlanabilir bir ObjectId üretir"""
+    return ObjectId(bytes(rng.getrandbits(8) for _ in range(12)))
+
+def term_starts(end_date: datetime, years: int):
+    """Bitiş tarihinden geriye doğru son `years` yılın dönem başlangıçlarını döndürür"""
+    starts = []
+    for year in range(end_date.year - years, end_date.year + 1):
+        for month in (2, 9):  # bahar ve güz dönemleri
+            start = datetime(year, month, 15)
+            if start <= end_date and start > end_date - timedelta(days=365 * years):
+                starts.append(start)
+    return starts
+
+def generate_users(rng: random.Random, preset: dict, password_hash: str):
+    def full_name():
+        return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+    users = [
+        {"email": f"ogretmen{i}@ogretmen.edu.tr", "password": password_hash, "full_name": full_name(), "role": "teacher"}
+        for i in range(preset["teachers"])
+    ]
+    users += [
+        {"email": f"ogrenci{i}@ogrenci.edu.tr", "password": password_hash, "full_name": full_name(), "role": "student"}
+        for i in range(preset["students"])
+    ]
+    return users
+
+def generate_courses(rng: random.Random, preset: dict, teachers: list, students: list):
+    courses = []
+    for i in range(preset["courses"]):
+        weekday = rng.randrange(len(WEEKDAYS))
+        hour = rng.choice(HOURS)
+        courses.append({
+            "_id": object_id(rng),
+            "name": f"{rng.choice(COURSE_SUBJECTS)} {i + 1}",
+            "code": f"DRS{i + 1:04d}",
+            "schedule": f"{WEEKDAYS[weekday]} {hour:02d}:00",
+            "teacher_email": teachers[i % len(teachers)]["email"],
+            "student_emails": [],
+            # Oturum tarihlerini üretmek için kullanılır, veritabanına yazılmaz
+            "_weekday": weekday,
+            "_hour": hour,
+        })
+
+    # Her öğrenciyi preset aralığındaki sayıda rastgele derse kaydet
+    min_courses, max_courses = preset["courses_per_student"]
+    for student in students:
+        count = min(rng.randint(min_courses, max_courses), len(courses))
+        for course in rng.sample(courses, count):
+            course["student_emails"].append(student["email"])
+    return courses
+
+def generate_attendance(rng: random.Random, courses: list, starts: list, end_date: datetime):
+    """Her ders için haftalık, kapanmış yoklama oturumları üretir"""
+    characters = string.ascii_uppercase + string.digits
+    for course in courses:
+        # Her öğrencinin bu dersteki devam eğilimi
+        diligence = {email: rng.uniform(0.4, 1.0) for email in course["student_emails"]}
+        for start in starts:
+            first_day = start + timedelta(days=(course["_weekday"] - start.weekday()) % 7, hours=course["_hour"])
+            for week in range(WEEKS_PER_TERM):
+                date = first_day + timedelta(weeks=week)
+                if date > end_date:
+                    break
+                yield {
+                    "_id": object_id(rng),
+                    "course_id": str(course["_id"]),
+                    "date": date.strftime("%Y-%m-%d %H:%M:%S"),
+                    "code": ''.join(rng.choices(characters, k=6)),
+                    "is_active": False,
+                    "students": [email for email, p in diligence.items() if rng.random() < p],
+                }
+
+def insert_in_batches(collection, documents, batch_size: int = BATCH_SIZE):
+    batch = []
+    total = 0
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            collection.insert_many(batch, ordered=False)
+            total += len(batch)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+        total += len(batch)
+    return total
+
+def seed_database(preset_name: str = "small", seed: int = 42, end_date: str = DEFAULT_END_DATE, drop: bool = False):
+    """Seçilen presete göre kullanıcı, ders ve yoklama verisini veritabanına yazar"""
+    preset = SIZE_PRESETS[preset_name]
+    rng = random.Random(seed)
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+
+    collections = (db.users, db.courses, db.attendance, db.attendance_archive)
+    if drop:
+        for collection in collections:
+            collection.drop()
+        print("Dropped existing users, courses and attendance records")
+    elif any(collection.estimated_document_count() for collection in collections):
+        raise RuntimeError("Database already contains data, use --drop to replace it")
+    create_indexes()
+
+    password_hash = get_password_hash(DEFAULT_PASSWORD)
+    users = generate_users(rng, preset, password_hash)
+    teachers = [user for user in users if user["role"] == "teacher"]
+    students = [user for user in users if user["role"] == "student"]
+    courses = generate_courses(rng, preset, teachers, students)
+
+    counts = {"users": insert_in_batches(db.users, users)}
+    counts["courses"] = insert_in_batches(
+        db.courses,
+        ({key: value for key, value in course.items() if not key.startswith("_") or key == "_id"} for course in courses)
+    )
+    counts["attendance"] = insert_in_batches(
+        db.attendance,
+        generate_attendance(rng, courses, term_starts(end, preset["years"]), end)
+    )
+    return counts
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Büyük ölçekli test verisi üret")
+    parser.add_argument("--preset", choices=SIZE_PRESETS.keys(), default="small", help="Veri boyutu")
+    parser.add_argument("--seed", type=int, default=42, help="Rastgele sayı üreteci tohumu")
+    parser.add_argument("--end-date", default=DEFAULT_END_DATE, help="Son yoklama tarihi (YYYY-MM-DD)")
+    parser.add_argument("--drop", action="store_true", help="Mevcut verileri önce sil")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        counts = seed_database(args.preset, args.seed, args.end_date, args.drop)
+    except RuntimeError as e:
+        print(f"Hata: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{counts['users']} kullanıcı, {counts['courses']} ders ve {counts['attendance']} yoklama "
+        f"{elapsed:.1f} saniyede oluşturuldu"
+    )
@@ -0,0 +1,57 @@
+import os
+import sys
+
+import pytest
+from pymongo import MongoClient, monitoring
+from pymongo.errors import PyMongoError
+
+# Testler ayrı bir veritabanında çalışır; main içe aktarılmadan önce ayarlanmalı
+os.environ.setdefault("MONGO_DB", "yoklama_sistemi_test")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Test veritabanına gönderilen MongoDB komutlarını kaydeder"""
+
+    def __init__(self):
+        self.commands = []
+
+    def started(self, event):
+        if event.database_name == os.environ["MONGO_DB"]:
+            self.commands.append(event.command_name)
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+# Dinleyici, main içindeki MongoClient oluşturulmadan önce kaydedilmeli
+command_counter = CommandCounter()
+monitoring.register(command_counter)
+
+import main  # noqa: E402
+
+
+@pytest.fixture
+def mongo_db():
+    """Boş bir test veritabanı döndürür; MongoDB yoksa testi atlar"""
+    probe = MongoClient(main.MONGO_URI, serverSelectionTimeoutMS=1000)
+    try:
+        version = probe.server_info()["versionArray"]
+    except PyMongoError:
+        pytest.skip(f"MongoDB is not available at {main.MONGO_URI} (set MONGO_URI to a 5.0+ server)")
+    finally:
+        probe.close()
+    if version[:2] < [5, 0]:
+        pytest.skip(f"MongoDB 5.0+ is required, found {'.'.join(map(str, version[:3]))}")
+
+    main.client.drop_database(os.environ["MONGO_DB"])
+    main.create_indexes()
+    yield main.db
+    main.client.drop_database(os.environ["MONGO_DB"])
+
+
+def auth_headers(email):
+    return {"Authorization": f"Bearer {main.create_access_token(data={'sub': email})}"}
@@ -0,0 +1,166 @@
+import asyncio
+import threading
+
+import anyio.to_thread
+import httpx
+
+import main
+from conftest import auth_headers
+
+
+def make_controller(low_limit=2, route_limits=None):
+    return main.AdmissionController({
+        "critical": {"limit": 4, "max_wait": 1.0},
+        "normal": {"limit": 4, "max_wait": 1.0},
+        "low": {"limit": low_limit, "max_wait": 0.05},
+    }, route_limits)
+
+
+def test_classify_matches_fixed_routes_exactly():
+    controller = make_controller()
+
+    assert controller.classify("POST", "/attendance/submit") == ("critical", None)
+    assert controller.classify("POST", "/token") == ("low", "POST /token")
+    assert controller.classify("GET", "/attendance/history/abc123") == ("low", "GET /attendance/history/")
+    assert controller.classify("POST", "/attendance/submitx") == ("normal", None)
+    assert controller.classify("POST", "/tokenfoo") == ("normal", None)
+    assert controller.classify("GET", "/token") == ("normal", None)
+
+
+def test_route_limit_sheds_within_its_class():
+    controller = make_controller(low_limit=4, route_limits={"POST /token": 1})
+
+    async def scenario():
+        assert await controller.acquire("low", "POST /token")
+        # /token kendi limitine ulaştı, ama düşük sınıfta başka yollar için yer var
+        token_admitted = await controller.acquire("low", "POST /token")
+        history_admitted = await controller.acquire("low")
+        return token_admitted, history_admitted
+
+    token_admitted, history_admitted = asyncio.run(scenario())
+
+    assert token_admitted is False
+    assert history_admitted is True
+    assert controller.route_stats["POST /token"] == {"limit": 1, "in_flight": 1, "shed": 1}
+    assert controller.stats["low"]["in_flight"] == 2
+
+
+def test_saturated_low_class_sheds_while_critical_is_admitted(monkeypatch):
+    controller = make_controller(low_limit=2)
+    monkeypatch.setattr(main, "admission_controller", controller)
+
+    async def scenario():
+        # Düşük öncelik sınıfındaki tüm yerleri doldur
+        for _ in range(2):
+            assert await controller.acquire("low")
+
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            login = await client.post("/token", data={"username": "a@ogrenci.edu.tr", "password": "x"})
+            history = await client.get("/attendance/history/abc123")
+            # Kimlik bilgisi olmadığı için 401 döner, ama kabul kontrolünden geçmiş olur
+            submit = await client.post("/attendance/submit", json={"course_id": "x", "code": "ABC123"})
+        return login, history, submit
+
+    login, history, submit = asyncio.run(scenario())
+
+    assert login.status_code == 503
+    assert login.headers["Retry-After"] == str(main.ADMISSION_RETRY_AFTER_SECONDS)
+    assert history.status_code == 503
+    assert submit.status_code == 401
+    assert controller.stats["low"]["shed"] == 2
+    assert controller.stats["critical"]["admitted"] == 1
+    assert controller.stats["critical"]["shed"] == 0
+    assert controller.stats["critical"]["in_flight"] == 0
+
+
+def test_low_priority_is_shed_while_critical_requests_queue():
+    controller = make_controller()
+    controller.stats["critical"]["queued"] = 1
+
+    assert asyncio.run(controller.acquire("low")) is False
+    assert controller.stats["low"]["shed"] == 1
+
+
+def test_admission_stats_requires_authentication():
+    transport = httpx.ASGITransport(app=main.app)
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/admission/stats")
+
+    assert asyncio.run(fetch()).status_code == 401
+
+
+def test_thread_pool_is_sized_for_all_admission_classes(monkeypatch):
+    controller = make_controller(low_limit=2)
+    monkeypatch.setattr(main, "admission_controller", controller)
+
+    async def configured_tokens():
+        main.configure_thread_limiter()
+        return anyio.to_thread.current_default_thread_limiter().total_tokens
+
+    assert asyncio.run(configured_tokens()) == 4 + 4 + 2
+
+
+def test_submission_completes_while_low_and_normal_hold_threads(mongo_db, monkeypatch):
+    controller = make_controller(low_limit=2)
+    monkeypatch.setattr(main, "admission_controller", controller)
+    monkeypatch.setitem(main.ADMISSION_ROUTES, ("GET", "/test/slow-low"), {"priority": "low"})
+
+    student_email = "ogrenci@ogrenci.edu.tr"
+    mongo_db.users.insert_one({"email": student_email, "password": "x", "full_name": "Öğrenci", "role": "student"})
+    course_id = str(mongo_db.courses.insert_one({
+        "name": "Fizik", "code": "FIZ101", "schedule": "Salı 10:00",
+        "teacher_email": "ogretmen@ogretmen.edu.tr", "student_emails": [student_email]
+    }).inserted_id)
+    mongo_db.attendance.insert_one({
+        "course_id": course_id, "date": "2025-01-01 10:00:00", "code": "ABC123", "is_active": True, "students": []
+    })
+
+    # Thread pool'da çalışan ve serbest bırakılana kadar bloklayan endpoint'ler
+    release = threading.Event()
+    started = threading.Semaphore(0)
+
+    def slow():
+        started.release()
+        release.wait(10)
+        return {}
+
+    main.app.add_api_route("/test/slow-low", slow, methods=["GET"])
+    main.app.add_api_route("/test/slow-normal", slow, methods=["GET"])
+    added_routes = main.app.router.routes[-2:]
+
+    async def scenario():
+        main.configure_thread_limiter()
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=15) as client:
+            # Normal ve düşük öncelik sınıflarının tüm yerlerini bloklayan isteklerle doldur
+            blockers = [asyncio.create_task(client.get("/test/slow-normal")) for _ in range(4)]
+            blockers += [asyncio.create_task(client.get("/test/slow-low")) for _ in range(2)]
+            for _ in blockers:
+                await asyncio.to_thread(started.acquire, True, 5)
+
+            try:
+                submit = await asyncio.wait_for(
+                    client.post(
+                        "/attendance/submit",
+                        json={"course_id": course_id, "code": "ABC123"},
+                        headers=auth_headers(student_email)
+                    ),
+                    timeout=5
+                )
+            finally:
+                release.set()
+            await asyncio.gather(*blockers)
+        return submit
+
+    try:
+        submit = asyncio.run(scenario())
+    finally:
+        for route in added_routes:
+            main.app.router.routes.remove(route)
+
+    assert submit.status_code == 200
+    assert controller.stats["normal"]["in_flight"] == 0
+    assert mongo_db.attendance.find_one({"course_id": course_id})["students"] == [student_email]
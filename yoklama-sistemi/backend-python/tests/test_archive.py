@@ -0,0 +1,74 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+import main
+from conftest import auth_headers
+
+TEACHER_EMAIL = "ogretmen@ogretmen.edu.tr"
+STUDENT_EMAILS = ["ogrenci1@ogrenci.edu.tr", "ogrenci2@ogrenci.edu.tr"]
+
+
+def seed_course(mongo_db):
+    mongo_db.users.insert_many(
+        [{"email": TEACHER_EMAIL, "password": "x", "full_name": "Öğretmen", "role": "teacher"}] +
+        [{"email": email, "password": "x", "full_name": email, "role": "student"} for email in STUDENT_EMAILS]
+    )
+    course_id = str(mongo_db.courses.insert_one({
+        "name": "Matematik",
+        "code": "MAT101",
+        "schedule": "Pazartesi 09:00",
+        "teacher_email": TEACHER_EMAIL,
+        "student_emails": STUDENT_EMAILS
+    }).inserted_id)
+
+    # Eski dönemlerden arşivlenecek oturumlar ve arşivlenmeyecek yeni bir oturum
+    sessions = [
+        ("2020-10-05 09:00:00", STUDENT_EMAILS),
+        ("2020-10-12 09:00:00", STUDENT_EMAILS[:1]),
+        ("2021-03-01 09:00:00", []),
+        ("2021-03-08 09:00:00", STUDENT_EMAILS[1:]),
+        (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), STUDENT_EMAILS[:1]),
+    ]
+    mongo_db.attendance.insert_many([
+        {"course_id": course_id, "date": date, "code": f"KOD{i}", "is_active": False, "students": list(students)}
+        for i, (date, students) in enumerate(sessions)
+    ])
+    return course_id
+
+
+def snapshot(client, course_id):
+    views = {"teacher_history": client.get(f"/attendance/history/{course_id}", headers=auth_headers(TEACHER_EMAIL)).json()}
+    for email in STUDENT_EMAILS:
+        views[email] = {
+            "history": client.get(f"/attendance/history/{course_id}", headers=auth_headers(email)).json(),
+            "dashboard": client.get("/me/dashboard", headers=auth_headers(email)).json(),
+        }
+    return views
+
+
+def test_archive_round_trip_keeps_history_and_dashboard(mongo_db):
+    course_id = seed_course(mongo_db)
+
+    with TestClient(main.app) as client:
+        before = snapshot(client, course_id)
+        result = main.archive_old_attendance(horizon_days=180, batch_size=1)
+        after = snapshot(client, course_id)
+
+    assert result == {"archived_sessions": 4, "archive_documents": 2}
+    assert mongo_db.attendance.count_documents({}) == 1
+    assert mongo_db.attendance_archive.count_documents({"course_id": course_id}) == 2
+    assert before[STUDENT_EMAILS[0]]["dashboard"]["courses"][0]["attendance_percentage"] == 60.0
+    assert after == before
+
+    # Tekrar çalıştırmak arşivi değiştirmez
+    assert main.archive_old_attendance(horizon_days=180)["archived_sessions"] == 0
+
+
+def test_parse_attendance_date_converts_offsets_to_local_time():
+    utc = main.parse_attendance_date("2024-03-01T09:00:00Z")
+    istanbul = main.parse_attendance_date("2024-03-01T12:00:00+03:00")
+
+    assert utc == istanbul
+    assert utc.tzinfo is None
+    assert main.parse_attendance_date("2024-03-01 09:00:00") == datetime(2024, 3, 1, 9, 0)
@@ -0,0 +1,51 @@
+from fastapi.testclient import TestClient
+
+import main
+from conftest import auth_headers, command_counter
+from seed_data import seed_database
+
+
+def fetch_dashboard(client, email):
+    command_counter.commands.clear()
+    response = client.get("/me/dashboard", headers=auth_headers(email))
+    assert response.status_code == 200
+    return response.json(), list(command_counter.commands)
+
+
+def test_dashboard_query_count_is_constant(mongo_db):
+    seed_database("tiny", seed=1)
+
+    # Preset, öğrencileri farklı sayıda derse kaydeder; en az ve en çok derse kayıtlı öğrencileri seç
+    enrollments = {}
+    for course in mongo_db.courses.find({}, {"student_emails": 1}):
+        for email in course["student_emails"]:
+            enrollments[email] = enrollments.get(email, 0) + 1
+    fewest = min(enrollments, key=enrollments.get)
+    most = max(enrollments, key=enrollments.get)
+    assert enrollments[fewest] < enrollments[most]
+
+    with TestClient(main.app) as client:
+        few_courses, few_courses_commands = fetch_dashboard(client, fewest)
+        many_courses, many_courses_commands = fetch_dashboard(client, most)
+
+    assert len(few_courses["courses"]) == enrollments[fewest]
+    assert len(many_courses["courses"]) == enrollments[most]
+    assert all(course["total_sessions"] > 0 for course in many_courses["courses"])
+    assert few_courses_commands == many_courses_commands
+    assert few_courses_commands.count("aggregate") == 1
+
+
+def test_dashboard_lookup_uses_course_id_index(mongo_db):
+    seed_database("tiny", seed=1)
+    student_email = mongo_db.courses.find_one()["student_emails"][0]
+
+    explain = mongo_db.command(
+        "explain",
+        {
+            "aggregate": "courses",
+            "pipeline": main.build_student_dashboard_pipeline(student_email),
+            "cursor": {}
+        },
+        verbosity="executionStats"
+    )
+    assert "course_id_1_is_active_1" in str(explain)
@@ -0,0 +1,15 @@
+import pytest
+
+from seed_data import seed_database
+
+
+def test_seed_refuses_existing_data_unless_dropped(mongo_db):
+    first = seed_database("tiny", seed=7)
+
+    with pytest.raises(RuntimeError):
+        seed_database("tiny", seed=7)
+    assert mongo_db.users.count_documents({}) == first["users"]
+
+    assert seed_database("tiny", seed=7, drop=True) == first
+    assert mongo_db.attendance.count_documents({}) == first["attendance"]
+    assert "course_id_1_is_active_1" in mongo_db.attendance.index_information()
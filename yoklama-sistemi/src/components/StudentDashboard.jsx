@@ -42,10 +42,10 @@ function StudentDashboard() {
   const fetchCourses = async () => {
     try {
       const token = localStorage.getItem('token');
-      const response = await axios.get('http://localhost:8000/courses', {
+      const response = await axios.get('http://localhost:8000/me/dashboard', {
         headers: { Authorization: `Bearer ${token}` }
       });
-      setCourses(response.data);
+      setCourses(response.data.courses);
     } catch (error) {
       console.error('Dersler yüklenirken hata:', error);
     } finally {
@@ -189,6 +189,9 @@ function StudentDashboard() {
                       <Typography color="textSecondary" gutterBottom>
                         Program: {course.schedule}
                       </Typography>
+                      <Typography color="textSecondary" gutterBottom>
+                        Devam Durumu: %{course.attendance_percentage} ({course.attended_sessions}/{course.total_sessions})
+                      </Typography>
                       <Box sx={{ mt: 2, display: 'flex', gap: 1, flexWrap: 'wrap' }}>
                         {course.has_active_attendance && !course.already_attended && (
                           <Chip